@@ -1,10 +1,90 @@
+import atexit
+import multiprocessing
+
 import numpy as np
-import pandas as pd
-from scipy.stats import norm
+from scipy.special import ndtr, ndtri
 import matplotlib.pyplot as plt
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
+_INV_SQRT_2PI = 0.3989422804014327  # 1 / sqrt(2 * pi), scales the standard normal density
+
+
+# a single worker pool is kept and reused across calls, since every spawned worker re-imports this
+# module (and numpy, scipy, numba) before it can do any work; it is replaced when the size changes
+_worker_pool = None
+_worker_pool_size = 0
+
+
+def _workerPool(processes):
+    # spawn rather than fork: forking after the threaded kernel has run can deadlock the workers.
+    # spawned workers re-run the calling script's __main__, so scripts that ask for processes > 1
+    # must make the call under `if __name__ == '__main__':`
+    global _worker_pool, _worker_pool_size
+    if _worker_pool is None or _worker_pool_size != processes:
+        _closeWorkerPool()
+        _worker_pool = multiprocessing.get_context('spawn').Pool(processes)
+        _worker_pool_size = processes
+    
+    return _worker_pool
+
+
+@atexit.register
+def _closeWorkerPool():
+    global _worker_pool, _worker_pool_size
+    if _worker_pool is not None:
+        _worker_pool.terminate()
+        _worker_pool.join()
+    _worker_pool = None
+    _worker_pool_size = 0
+
+
+def _simulateChunk(seed, n_trials, mu, SD, production):
+    # runs in a worker process, so it gets its own seed rather than a copy of the parent's RNG state
+    rng = np.random.default_rng(seed)
+    demand = rng.standard_normal(n_trials, dtype=np.float32)
+    demand *= np.float32(SD)
+    demand += np.float32(mu)
+    production = np.float32(production)
+    
+    # units sold and leftovers both follow from the lost sales: min(D, Q) = D - lost, leftover = Q - sold
+    lost_sales_quantity = np.maximum(demand - production, 0)
+    sum_lost_sales = lost_sales_quantity.sum(dtype=np.float64)
+    sum_units_sold = demand.sum(dtype=np.float64) - sum_lost_sales
+    sum_leftover = float(production) * n_trials - sum_units_sold
+    
+    return sum_units_sold, sum_lost_sales, sum_leftover, n_trials
+
+
+if numba is not None:
+    # an explicit signature compiles the kernel eagerly at import; cache=True persists the machine
+    # code in __pycache__ so later imports load it instead of recompiling
+    @numba.njit('UniTuple(float64, 3)(float64, float64, float64, int64)', parallel=True, fastmath=True, cache=True)
+    def _simulateKernel(mu, SD, production, n):
+        # one threaded pass over the draws, accumulating the means without any intermediate arrays.
+        # draws come from numba's own per-thread generators, which ignore the instance generator and
+        # cannot be seeded reproducibly under prange, so seeded instances use the NumPy path instead
+        units_sold = 0.0
+        lost_sales = 0.0
+        leftover = 0.0
+        
+        for i in numba.prange(n):
+            demand = mu + SD * np.random.standard_normal()
+            if demand < production:
+                units_sold += demand
+                leftover += production - demand
+            else:
+                units_sold += production
+                lost_sales += demand - production
+        
+        return units_sold / n, lost_sales / n, leftover / n
+
+
 class Newsvendor:
-    def __init__(self, demand, SD, sell, cost, salvage):
+    def __init__(self, demand, SD, sell, cost, salvage, seed=None):
         self.mu = demand
         self.SD = SD
         self.sellprice = sell
@@ -13,6 +93,12 @@ class Newsvendor:
         self._Cu = self.sellprice - self.cost
         self._Co = self.cost - self.salvageprice
         self._criticalRatio = self._Cu / (self._Cu + self._Co)
+        self._optimalProduction = None
+        self._stockoutProba = None
+        self._rng = np.random.default_rng(seed)
+        self._seeded = seed is not None
+        self._demand_buf = None
+        self._lost_buf = None
         
         
     def clearParameters(self):
@@ -24,6 +110,8 @@ class Newsvendor:
         self._Cu = 0
         self._Co = 0
         self._criticalRatio = 0
+        self._optimalProduction = None
+        self._stockoutProba = None
         
     def setParameters(self, demand, SD, sell, cost, salvage):
         self.mu = demand
@@ -34,6 +122,8 @@ class Newsvendor:
         self._Cu = self.sellprice - self.cost
         self._Co = self.cost - self.salvageprice
         self._criticalRatio = self._Cu / (self._Cu + self._Co)
+        self._optimalProduction = None
+        self._stockoutProba = None
         
     def showParameters(self):
         summary = {'Demand': self.mu,
@@ -44,155 +134,218 @@ class Newsvendor:
         
         return summary
         
+    def _optimum(self):
+        # the critical-ratio quantity and its stockout probability only change with the parameters,
+        # so they are computed on first use and cached until setParameters/clearParameters
+        if self._optimalProduction is None:
+            self._optimalProduction = round(self.mu + self.SD * ndtri(self._criticalRatio))
+            self._stockoutProba = ndtr((self.mu - self._optimalProduction) / self.SD)
+        
+        return self._optimalProduction, self._stockoutProba
+    
     def optimalQuantity(self):
-        optimal_production = round(norm(self.mu, self.SD).ppf(self._criticalRatio))
+        optimal_production, _ = self._optimum()
         safety_stock = optimal_production - self.mu
         quantity_summary = {'optimal quantity': optimal_production, 'average demand': self.mu, 'safety stock': safety_stock}
         
         return quantity_summary
     
-    def optimalSummary(self, simulations=1, trials=1000000):
-        production = round(norm(self.mu, self.SD).ppf(self._criticalRatio))
-        demand = np.round(np.random.normal(self.mu, self.SD, (simulations, trials)))
-
-        # salvage quantities
-        salvage_quantity = production - demand
-        salvage_quantity = np.where(salvage_quantity<0, 0, salvage_quantity)
-        salvage_revenue = salvage_quantity * self.salvageprice
-
-        # expected lost sales
-        lost_sales_quantity = demand - production
-        lost_sales_quantity = np.where(lost_sales_quantity<0, 0, lost_sales_quantity)
+    def _sampleDemand(self, simulations, trials):
+        # refill a cached buffer in place instead of allocating a new sample every call;
+        # float32 halves the memory traffic. demand is left unrounded since nothing downstream
+        # needs integers; the reported quantities are rounded instead.
+        # a single simulation is kept one-dimensional, otherwise each row is one simulation
+        shape = (trials,) if simulations == 1 else (simulations, trials)
+        if self._demand_buf is None or self._demand_buf.shape != shape:
+            self._demand_buf = np.empty(shape, dtype=np.float32)
+        
+        self._rng.standard_normal(out=self._demand_buf, dtype=np.float32)
+        np.multiply(self._demand_buf, np.float32(self.SD), out=self._demand_buf)
+        np.add(self._demand_buf, np.float32(self.mu), out=self._demand_buf)
+        
+        return self._demand_buf
+    
+    def _lostBuffer(self, shape):
+        # work array for the clipped lost sales quantities of the single-quantity simulation, reused across calls
+        if self._lost_buf is None or self._lost_buf.shape != shape:
+            self._lost_buf = np.empty(shape, dtype=np.float32)
+        
+        return self._lost_buf
+    
+    def _simulate(self, production, simulations, trials, processes=1):
+        # every simulation is an independent run of `trials` draws; the results hold one mean per simulation
+        if processes > 1:
+            # split each simulation's trials across worker processes and combine their partial sums;
+            # see _workerPool for the __main__ guard this needs in scripts
+            chunk_sizes = [trials // processes + (k < trials % processes) for k in range(processes)]
+            sums = np.empty((simulations, 3))
+            
+            pool = _workerPool(processes)
+            
+            for k in range(simulations):
+                seeds = self._rng.bit_generator.seed_seq.spawn(processes)
+                partials = pool.starmap(_simulateChunk,
+                                        [(seed, size, self.mu, self.SD, production) for seed, size in zip(seeds, chunk_sizes)])
+                sums[k] = np.sum(partials, axis=0)[:3]
+            
+            avg_units_sold, avg_lost_sales, avg_leftover = (sums / trials).T
+            
+        elif numba is not None and not self._seeded:
+            means = np.array([_simulateKernel(float(self.mu), float(self.SD), float(production), trials)
+                              for k in range(simulations)])
+            avg_units_sold, avg_lost_sales, avg_leftover = means.T
+            
+        else:
+            demand = self._sampleDemand(simulations, trials)
+            production_32 = np.float32(production)
+            lost_sales_quantity = self._lostBuffer(demand.shape)
 
-        # items sold
-        units_sold = np.minimum(demand, production)
+            # expected lost sales
+            np.subtract(demand, production_32, out=lost_sales_quantity)
+            np.maximum(lost_sales_quantity, 0, out=lost_sales_quantity)
 
-        # item rev
-        unit_revenue = units_sold * self.sellprice
+            # both sums are taken back to back while the arrays are still warm, accumulating in
+            # float64 so the means don't lose precision over a million samples
+            avg_lost_sales = np.add.reduce(lost_sales_quantity, axis=-1, dtype=np.float64) / trials
+            avg_demand = np.add.reduce(demand, axis=-1, dtype=np.float64) / trials
 
-        # total rev
-        TR = unit_revenue + salvage_revenue
+            # items sold are min(D, Q) = D - lost sales, and leftovers are Q - items sold,
+            # so neither needs its own array
+            avg_units_sold = avg_demand - avg_lost_sales
+            avg_leftover = float(production) - avg_units_sold
 
-        # COGS
-        COGS = production * self.cost
+        # gross profit is linear in sales and leftovers, so its mean follows from theirs
+        # without building revenue, COGS and profit arrays
+        avg_profit = avg_units_sold * self.sellprice + avg_leftover * self.salvageprice - production * self.cost
 
-        # gross profit
-        GP = TR - COGS
+        return avg_profit, avg_units_sold, avg_lost_sales, avg_leftover
+    
+    def _analyticSummary(self, production):
+        # closed form via the standard normal loss function L(z) = pdf(z) - z * (1 - cdf(z))
+        z = (production - self.mu) / self.SD
+        avg_lost_sales = self.SD * (_INV_SQRT_2PI * np.exp(-0.5 * z * z) - z * ndtr(-z))
+        avg_units_sold = self.mu - avg_lost_sales
+        avg_leftover = production - avg_units_sold
+        avg_profit = avg_units_sold * self.sellprice + avg_leftover * self.salvageprice - production * self.cost
         
-        dict_summ = {'Order Quantity': production,
-                    'Expected Profit': round(np.mean(GP), 2),
-                    'Expected Sales Quantity': round(np.mean(units_sold), 0),
-                    'Expected Lost Sales Quantity': np.round(np.mean(lost_sales_quantity), 0),
-                    'Expected Leftover Quantity': round(np.mean(salvage_quantity), 0),
-                    'Fill Rate': round(np.mean(units_sold) / self.mu, 4),
-                    'Stockout probability': round(norm.sf((production-self.mu)/self.SD), 4)}
+        return avg_profit, avg_units_sold, avg_lost_sales, avg_leftover
+    
+    def _expectedOutcomes(self, production, method, simulations, trials, processes):
+        # returns the expected profit, sales, lost sales and leftovers, plus the spread of the
+        # per-simulation estimates when several simulations were run.
+        # the closed form is the default; passing any simulation setting selects method='mc'
+        mc_settings = (simulations, trials, processes)
+        if method is None:
+            method = 'analytic' if all(x is None for x in mc_settings) else 'mc'
         
+        if method == 'analytic':
+            if any(x is not None for x in mc_settings):
+                raise ValueError("simulations, trials and processes only apply to method='mc'")
+            return self._analyticSummary(production), {}
+        elif method == 'mc':
+            simulations = 1 if simulations is None else simulations
+            trials = 1000000 if trials is None else trials
+            processes = 1 if processes is None else processes
+            per_simulation = self._simulate(production, simulations, trials, processes)
+            means = tuple(np.mean(x) for x in per_simulation)
+            spread = {}
+            
+            if simulations > 1:
+                labels = ['Profit', 'Sales Quantity', 'Lost Sales Quantity', 'Leftover Quantity']
+                for label, x in zip(labels, per_simulation):
+                    spread['{} SD Across Simulations'.format(label)] = round(np.std(x, ddof=1), 4)
+            
+            return means, spread
+        else:
+            raise ValueError("method must be 'analytic' or 'mc', got {!r}".format(method))
+    
+    def optimalSummary(self, simulations=None, trials=None, processes=None, method=None):
+        production, stockout_proba = self._optimum()
+        (avg_profit, avg_units_sold, avg_lost_sales, avg_leftover), spread = self._expectedOutcomes(production, method, simulations, trials, processes)
         
+        dict_summ = {'Order Quantity': production,
+                    'Expected Profit': round(avg_profit, 2),
+                    'Expected Sales Quantity': round(avg_units_sold, 0),
+                    'Expected Lost Sales Quantity': round(avg_lost_sales, 0),
+                    'Expected Leftover Quantity': round(avg_leftover, 0),
+                    'Fill Rate': round(avg_units_sold / self.mu, 4),
+                    'Stockout probability': round(stockout_proba, 4)}
+        dict_summ.update(spread)
         
         return dict_summ
     
-    def targetInStockProba(self, instock_pct, simulations=1, trials=1000000):
-        production = round(norm(self.mu, self.SD).ppf(instock_pct))
-        demand = np.round(np.random.normal(self.mu, self.SD, (simulations, trials)))
-
-        # salvage quantities
-        salvage_quantity = production - demand
-        salvage_quantity = np.where(salvage_quantity<0, 0, salvage_quantity)
-        salvage_revenue = salvage_quantity * self.salvageprice
-
-        # expected lost sales
-        lost_sales_quantity = demand - production
-        lost_sales_quantity = np.where(lost_sales_quantity<0, 0, lost_sales_quantity)
-        avg_lost_sales = round(np.mean(lost_sales_quantity), 0) #for dict_summ
-
-        # items sold
-        units_sold = np.minimum(demand, production)
-
-        # item rev
-        unit_revenue = units_sold * self.sellprice
-
-        # total rev
-        TR = unit_revenue + salvage_revenue
-
-        # COGS
-        COGS = production * self.cost
-
-        # gross profit
-        GP = TR - COGS
+    def targetInStockProba(self, instock_pct, simulations=None, trials=None, processes=None, method=None):
+        production = round(self.mu + self.SD * ndtri(instock_pct))
+        (avg_profit, avg_units_sold, avg_lost_sales, avg_leftover), spread = self._expectedOutcomes(production, method, simulations, trials, processes)
         
         dict_summ = {'Chosen In-Stock Probability': instock_pct,
                     'Order Quantity': production,
-                    'Expected Profit': round(np.mean(GP), 2),
-                    'Expected Sales Quantity': round(np.mean(units_sold), 0),
-                    'Expected Lost Sales Quantity': avg_lost_sales,
-                    'Expected Leftover Quantity': round(np.mean(salvage_quantity), 0),
-                    'Fill Rate': round(np.mean(units_sold) / self.mu, 4),
-                    'Stockout probability': round(norm.sf((production-self.mu)/self.SD), 4)}
+                    'Expected Profit': round(avg_profit, 2),
+                    'Expected Sales Quantity': round(avg_units_sold, 0),
+                    'Expected Lost Sales Quantity': round(avg_lost_sales, 0),
+                    'Expected Leftover Quantity': round(avg_leftover, 0),
+                    'Fill Rate': round(avg_units_sold / self.mu, 4),
+                    'Stockout probability': round(ndtr((self.mu-production)/self.SD), 4)}
+        dict_summ.update(spread)
         
         return dict_summ
     
-    def quantityPerformanceSummary(self, quantity, simulations=1, trials=1000000):
+    def quantityPerformanceSummary(self, quantity, simulations=None, trials=None, processes=None, method=None):
         production = quantity
-        demand = np.round(np.random.normal(self.mu, self.SD, (simulations, trials)))
-
-        # salvage quantities
-        salvage_quantity = production - demand
-        salvage_quantity = np.where(salvage_quantity<0, 0, salvage_quantity)
-        salvage_revenue = salvage_quantity * self.salvageprice
-
-        # expected lost sales
-        lost_sales_quantity = demand - production
-        lost_sales_quantity = np.where(lost_sales_quantity<0, 0, lost_sales_quantity)
-        avg_lost_sales = round(np.mean(lost_sales_quantity), 0) #for dict_summ
-
-        # items sold
-        units_sold = np.minimum(demand, production)
-
-        # item rev
-        unit_revenue = units_sold * self.sellprice
-
-        # total rev
-        TR = unit_revenue + salvage_revenue
-
-        # COGS
-        COGS = production * self.cost
-
-        # gross profit
-        GP = TR - COGS
+        (avg_profit, avg_units_sold, avg_lost_sales, avg_leftover), spread = self._expectedOutcomes(production, method, simulations, trials, processes)
         
         dict_summ = {'Chosen Order Quantity': production,
-                    'Expected Profit': round(np.mean(GP), 2),
-                    'Expected Sales Quantity': round(np.mean(units_sold), 0),
-                    'Expected Lost Sales Quantity': avg_lost_sales,
-                    'Expected Leftover Quantity': round(np.mean(salvage_quantity), 0),
-                    'Fill Rate': round(np.mean(units_sold) / self.mu, 4),
-                    'Stockout probability': round(norm.sf((production-self.mu)/self.SD), 4)}
+                    'Expected Profit': round(avg_profit, 2),
+                    'Expected Sales Quantity': round(avg_units_sold, 0),
+                    'Expected Lost Sales Quantity': round(avg_lost_sales, 0),
+                    'Expected Leftover Quantity': round(avg_leftover, 0),
+                    'Fill Rate': round(avg_units_sold / self.mu, 4),
+                    'Stockout probability': round(ndtr((self.mu-production)/self.SD), 4)}
+        dict_summ.update(spread)
                 
         return dict_summ
     
-    def fillRateSummary(self, upper_SD_bound=3, steps=10, showGraph=False, simulations=1, trials=1000000):
+    def fillRateSummary(self, upper_SD_bound=3, steps=10, showGraph=False, simulations=None, trials=None, method=None,
+                        as_dataframe=False):
         
         # set bounds for testing production quantities
-        upper_production_bound = self.mu + (upper_SD_bound * self.SD) # upper limit set by number of SD away from mean
-        unit_production_range = range(0, upper_production_bound, steps)
+        upper_production_bound = int(self.mu + (upper_SD_bound * self.SD)) # upper limit set by number of SD away from mean
+        quantities = np.arange(0, upper_production_bound, steps, dtype=np.int64)
         
-        # create arrays to store fill rates
-        fill_rate_array = np.zeros(len(unit_production_range))
+        # the closed form is the default; passing any simulation setting selects method='mc'
+        if method is None:
+            method = 'analytic' if simulations is None and trials is None else 'mc'
         
-        for i, j in enumerate(unit_production_range):
-            production = j
-            demand = np.round(np.random.normal(self.mu, self.SD, (simulations, trials)))
+        if method == 'analytic':
+            if simulations is not None or trials is not None:
+                raise ValueError("simulations and trials only apply to method='mc'")
+            
+            # E[min(D, Q)] from the loss function, for every quantity at once; it is clamped at 0
+            # because at Q=0 mu - E[lost] cancels to a tiny negative number
+            _, avg_units_sold, _, _ = self._analyticSummary(quantities.astype(np.float64))
+            fill_rate_array = np.round(np.maximum(avg_units_sold, 0) / self.mu, 4)
             
-            # average of units_sold array is numerator component of fill rate
-            units_sold = np.minimum(demand, production)
+        elif method == 'mc':
+            # create arrays to store fill rates
+            fill_rate_array = np.empty(quantities.size)
             
-            fill_rate_array[i] = round(np.mean(units_sold) / self.mu, 4)
+            # demand does not depend on the production quantity, so sample it once
+            demand = self._sampleDemand(1 if simulations is None else simulations,
+                                        1000000 if trials is None else trials)
+            
+            for i, production in enumerate(quantities):
+                # average of units_sold array is numerator component of fill rate
+                units_sold = np.minimum(demand, np.float32(production))
+                
+                # adding 0.0 clears the sign of a rounded -0.0
+                fill_rate_array[i] = round(np.mean(units_sold, dtype=np.float64) / self.mu, 4) + 0.0
+                
+        else:
+            raise ValueError("method must be 'analytic' or 'mc', got {!r}".format(method))
         
-        # create dataframe
-        df_fill_rate = pd.DataFrame({
-            'Quantity': np.array(unit_production_range),
-            'Fill Rate': fill_rate_array
-        }).set_index('Quantity')
+        # the grid is usually short, so a dict of arrays is returned unless a dataframe is asked for
+        fill_rate = {'Quantity': quantities,
+                     'Fill Rate': fill_rate_array}
         
         
         if showGraph==True:
@@ -201,7 +354,7 @@ class Newsvendor:
             ax.set_title('Corresponding Fill Rate from Each Production Quantity')
             ax.set_xlabel('Quantity')
             ax.set_ylabel('Fill Rate')
-            ax.plot(df_fill_rate.index, df_fill_rate['Fill Rate'])
+            ax.plot(fill_rate['Quantity'], fill_rate['Fill Rate'])
             
             fig.tight_layout()
             plt.show()
@@ -209,64 +362,70 @@ class Newsvendor:
         else:
             None
         
-        return df_fill_rate
+        if as_dataframe:
+            import pandas as pd
+            return pd.DataFrame(fill_rate).set_index('Quantity')
+        
+        return fill_rate
     
-    def quantityScreen(self, upper_SD_bound=3, steps=10, simulations=1, trials=1000000):
-        upper_production_bound = self.mu +(upper_SD_bound * self.SD)
-        unit_production_range = range(0, upper_production_bound, steps)
-        
-        # create arrays to store data
-        avg_profit_list = np.zeros(len(unit_production_range))
-        max_profit_list = np.zeros(len(unit_production_range))
-        min_profit_list = np.zeros(len(unit_production_range))
-        avg_units_sold = np.zeros(len(unit_production_range))
-        avg_lost_sales = np.zeros(len(unit_production_range))
-        avg_leftover_units = np.zeros(len(unit_production_range))
-        
-        for i, j in enumerate(unit_production_range):
-            production = j
-            demand = np.round(np.random.normal(self.mu, self.SD, (simulations, trials)))
-            
-            # salvage quantities
-            salvage_quantity = production - demand
-            salvage_quantity = np.where(salvage_quantity<0, 0, salvage_quantity)
-            salvage_revenue = salvage_quantity * self.salvageprice
-            
-            # expected lost sales
-            lost_sales_quantity = demand - production
-            lost_sales_quantity = np.where(lost_sales_quantity<0, 0, lost_sales_quantity)
-
-
-            # items sold
-            units_sold = np.minimum(demand, production)
-
-            # item rev
-            unit_revenue = units_sold * self.sellprice
-
-            # total rev
-            TR = unit_revenue + salvage_revenue
-
-            # COGS
-            COGS = production * self.cost
-
-            # gross profit
-            GP = TR - COGS
-            
-            avg_profit_list[i] = round(np.mean(GP),2)
-            max_profit_list[i] = round(np.max(GP),2)
-            min_profit_list[i] = round(np.min(GP),2)
-            avg_units_sold[i] = round(np.mean(units_sold), 0)
-            avg_lost_sales[i] = round(np.mean(lost_sales_quantity),0)
-            avg_leftover_units[i] = round(np.mean(salvage_quantity),0)
+    def quantityScreen(self, upper_SD_bound=3, steps=10, simulations=1, trials=1000000, as_dataframe=False):
+        upper_production_bound = int(self.mu + (upper_SD_bound * self.SD))
+        quantities = np.arange(0, upper_production_bound, steps, dtype=np.int64)
+        
+        # demand does not depend on the production quantity, so sample it once
+        demand = self._sampleDemand(simulations, trials)
+        avg_demand = np.add.reduce(demand, axis=None, dtype=np.float64) / demand.size
+        
+        # lost sales are the only quantity that needs a pass over the samples; evaluate them for all
+        # production quantities in one broadcast over (quantities, simulations, trials),
+        # a block of rows at a time to cap peak memory
+        quantities_32 = quantities.astype(np.float32)
+        chunk_size = 16
+        # the block buffer is local so the large screen array is freed on return instead of being
+        # pinned on the instance and swapped against the single-quantity buffer
+        lost_buf = np.empty((min(chunk_size, quantities.size),) + demand.shape, dtype=np.float32)
+        sample_axes = tuple(range(1, lost_buf.ndim))
+        lost_sales = np.empty(quantities.size)
+        
+        for start in range(0, quantities.size, chunk_size):
+            rows = slice(start, start + chunk_size)
+            production = quantities_32[rows].reshape((-1,) + (1,) * demand.ndim)
             
-        df_summ = pd.DataFrame({
-            'Units': unit_production_range,
-            'Avg Profit': avg_profit_list,
-            'Max Profit': max_profit_list,
-            'Min Profit': min_profit_list,
-            'Avg Units Sold': avg_units_sold,
-            'Avg Lost Sales': avg_lost_sales,
-            'Avg Leftover Units': avg_leftover_units
-        }).set_index('Units')
-        
-        return df_summ
\ No newline at end of file
+            lost_sales_quantity = lost_buf[:len(production)]
+            np.subtract(demand, production, out=lost_sales_quantity)
+            np.maximum(lost_sales_quantity, 0, out=lost_sales_quantity)
+            lost_sales[rows] = np.add.reduce(lost_sales_quantity, axis=sample_axes, dtype=np.float64) / demand.size
+        
+        # items sold, leftovers and profit are linear in the lost sales, so their means follow directly
+        production = quantities.astype(np.float64)
+        units_sold = avg_demand - lost_sales
+        leftover_units = production - units_sold
+        profit = units_sold * self.sellprice + leftover_units * self.salvageprice - production * self.cost
+        
+        # profit is monotone in demand (linear up to the order quantity, flat above it), so the
+        # extreme outcomes over the sample come from the smallest and largest sampled demand
+        def profit_at(d):
+            return np.minimum(d, production) * self.sellprice + np.maximum(production - d, 0) * self.salvageprice - production * self.cost
+        
+        profit_low, profit_high = profit_at(float(demand.min())), profit_at(float(demand.max()))
+        
+        avg_profit_list = np.round(profit, 2)
+        max_profit_list = np.round(np.maximum(profit_low, profit_high), 2)
+        min_profit_list = np.round(np.minimum(profit_low, profit_high), 2)
+        avg_units_sold = np.round(units_sold, 0)
+        avg_lost_sales = np.round(lost_sales, 0)
+        avg_leftover_units = np.round(leftover_units, 0)
+        
+        screen = {'Units': quantities,
+                  'Avg Profit': avg_profit_list,
+                  'Max Profit': max_profit_list,
+                  'Min Profit': min_profit_list,
+                  'Avg Units Sold': avg_units_sold,
+                  'Avg Lost Sales': avg_lost_sales,
+                  'Avg Leftover Units': avg_leftover_units}
+        
+        if as_dataframe:
+            import pandas as pd
+            return pd.DataFrame(screen).set_index('Units')
+        
+        return screen
\ No newline at end of file